@@ -1,7 +1,38 @@
+import sys
+from itertools import chain, repeat
 from typing import Literal
 
+
+def _intern(token: any) -> any:
+    """Interns string tokens so membership probes can match on identity."""
+    return sys.intern(token) if isinstance(token, str) else token
+
+
+_END = object()
+
+_LOGICAL = frozenset(("AND", "OR"))
+_COMPARISON = frozenset(("=", ">", "<", ">=", "<=", "<>", "!="))
+_SPECIAL_COMPARISON = frozenset(("BETWEEN", "IN"))
+_AGGREGATES = frozenset(("MIN", "MAX", "SUM", "AVG", "COUNT"))
+
+_SQL_COMPARATORS = {comparator: comparator for comparator in _COMPARISON | _SPECIAL_COMPARISON}
+_SQL_COMPARATORS["!="] = "<>"
+
+_LOGIC_CACHE_SIZE = 1024
+_LOGIC_CACHE_MAX_VALUES = 32
+
+_REQUIRED_INPUTS = {"query": str, "items": list, "table": str}
+
+_ERR_NOTHING = (False, "Nothing To Compute")
+_ERR_BOOLEAN_LENGTH = (False, "Invalid boolean length, must be >= 2")
+_ERR_MISSING = {item: (False, f"Missing argument {item}") for item in _REQUIRED_INPUTS}
+_ERR_TYPE = {item: (False, f"{item} not right type, {itemtype}") for item, itemtype in _REQUIRED_INPUTS.items()}
+
+_IN_PLACEHOLDERS = tuple("?" + ",?" * count for count in range(32))
+
+
 class JsonSQL():
-    def __init__(self, allowed_queries: list=[], allowed_items: list=[], allowed_tables: list=[], allowed_connections: list=[], allowed_columns: dict={}):
+    def __init__(self, allowed_queries: list | None=None, allowed_items: list | None=None, allowed_tables: list | None=None, allowed_connections: list | None=None, allowed_columns: dict | None=None):
         """Initializes JsonSQL instance with allowed queries, items, tables, 
         connections, and columns.
         
@@ -12,31 +43,40 @@ class JsonSQL():
         allowed_connections (list): Allowed SQL JOIN conditions.
         allowed_columns (dict): Allowed columns per table.
         """
-        self.ALLOWED_QUERIES = allowed_queries
-        self.ALLOWED_ITEMS = allowed_items
-        self.ALLOWED_TABLES = allowed_tables
-        self.ALLOWED_CONNECTIONS = allowed_connections
-        self.ALLOWED_COLUMNS = allowed_columns
+        allowed_queries = () if allowed_queries is None else allowed_queries
+        allowed_items = () if allowed_items is None else allowed_items
+        allowed_tables = () if allowed_tables is None else allowed_tables
+        allowed_connections = () if allowed_connections is None else allowed_connections
+        allowed_columns = {} if allowed_columns is None else allowed_columns
+
+        self.ALLOWED_QUERIES = frozenset(map(_intern, allowed_queries))
+        self.ALLOWED_ITEMS = frozenset(map(_intern, allowed_items))
+        self.ALLOWED_TABLES = frozenset(map(_intern, allowed_tables))
+        self.ALLOWED_CONNECTIONS = frozenset(map(_intern, allowed_connections))
 
-        self.LOGICAL = ("AND", "OR")
-        self.COMPARISON = ("=", ">", "<", ">=", "<=", "<>","!=")
-        self.SPECIAL_COMPARISON = ("BETWEEN", "IN")
-        self.AGGREGATES = ("MIN", "MAX","SUM","AVG","COUNT")
+        self.LOGICAL = _LOGICAL
+        self.COMPARISON = _COMPARISON
+        self.SPECIAL_COMPARISON = _SPECIAL_COMPARISON
+        self.AGGREGATES = _AGGREGATES
+
+        self.ALLOWED_COLUMNS = {_intern(column): valuetype for column, valuetype in allowed_columns.items()}
+
+        self._leaf_tmpl = {}
+        self._logic_cache = {}
 
     def make_aggregate(self, aggregate:dict, param:bool=False) -> tuple[str, any]:
-        return f"{list(aggregate)[0]}({aggregate[list(aggregate)[0]] if not param else '?'})", aggregate[list(aggregate)[0]]
+        operation = next(iter(aggregate))
+        argument = aggregate[operation]
+        return f"{operation}({argument if not param else '?'})", argument
 
     def is_another_column(self, value:str) -> bool:
-        try:
-            return value in self.ALLOWED_COLUMNS
-        except TypeError:
-            return False
+        return isinstance(value, str) and value in self.ALLOWED_COLUMNS
     
     def is_valid_aggregate(self, aggregate:dict) -> bool:
-        if not isinstance(aggregate, dict):
+        if not isinstance(aggregate, dict) or len(aggregate) == 0:
             return False
         
-        operation = list(aggregate)[0]
+        operation = next(iter(aggregate))
         value = aggregate[operation]
         if operation not in self.AGGREGATES:
             return False
@@ -46,7 +86,7 @@ class JsonSQL():
     def is_valid_value(self, value:any, valuetype:any) -> bool:
         if isinstance(value, dict):
             return self.is_valid_aggregate(value)
-        elif not isinstance(value, list) and self.is_another_column(value):
+        elif self.is_another_column(value):
             return True
         return isinstance(value, valuetype)
 
@@ -64,33 +104,16 @@ class JsonSQL():
         Returns:
             bool: True if it is a valid special comparison, False otherwise.
         """
-        def all_values_allowed(value, valuetype):
-            """Checks if all values in a list are of the specified type.
-        
-            Args:
-                value (list): The list of values to check.
-                valuetype: The expected type of each value.
-            
-            Returns:
-                bool: True if all values match the expected type, False otherwise.
-            """
-            valid = True
-            for entry in value:
-                if not self.is_valid_value(entry,valuetype):
-                    valid = False
-                    break
-            return valid
+        if not isinstance(value, list):
+            return False
 
-        if not isinstance(value, list) or not all_values_allowed(value, valuetype):
+        if not (comparator == "BETWEEN" and len(value) == 2) and not (comparator == "IN" and len(value) > 0):
             return False
-        
-        if comparator == "BETWEEN" and len(value) == 2:
-            return True
 
-        elif comparator == "IN" and len(value) > 0:
+        if not issubclass(dict, valuetype) and all(map(isinstance, value, repeat(valuetype))):
             return True
-        
-        return False
+
+        return all(self.is_valid_value(entry, valuetype) for entry in value)
 
     def is_valid_comparison(self, column:str, comparison:dict) -> bool:
         """Checks if a comparison operator and value are valid for a column.
@@ -105,21 +128,37 @@ class JsonSQL():
         Returns:
             bool: True if the comparison is valid, False otherwise.
         """
-        comparator = list(comparison)[0]
+        if not isinstance(comparison, dict) or len(comparison) == 0:
+            return False
+
+        comparator = next(iter(comparison))
 
         if comparator not in self.COMPARISON and comparator not in self.SPECIAL_COMPARISON:
             return False
         
         value = comparison[comparator]
-        if self.is_valid_value(value, self.ALLOWED_COLUMNS[column]) or self.is_special_comparison(comparator, value, self.ALLOWED_COLUMNS[column]):
+        valuetype = self.ALLOWED_COLUMNS[column]
+        if self.is_valid_value(value, valuetype) or self.is_special_comparison(comparator, value, valuetype):
             return True
         return False
 
-    def logic_parse(self, json_input: dict) -> tuple[Literal[False], str] | tuple[Literal[True], str, tuple]:
+    def _leaf_template(self, column: str, comparator: str) -> str:
+        """Builds and remembers the parameterized SQL for a column comparison."""
+        placeholder = "? AND ?" if comparator == "BETWEEN" else "?"
+        template = f"{column} {_SQL_COMPARATORS.get(comparator, comparator)} {placeholder}"
+        self._leaf_tmpl[column, comparator] = template
+        return template
+
+    def _logic_node(self, json_input: dict) -> tuple[Literal[False], str] | tuple[Literal[True], str, tuple] | tuple[None, str, list]:
+        """Validates a single logic node without descending into AND/OR cases.
+
+        Returns the parsed leaf, an error, or (None, operator, cases) for a 
+        valid AND/OR node whose cases still need to be parsed.
+        """
         if len(json_input) == 0:
-            return False, "Nothing To Compute"
+            return _ERR_NOTHING
         
-        value: str = list(json_input.keys())[0]
+        value: str = next(iter(json_input))
         
         if value not in self.ALLOWED_COLUMNS and value not in self.LOGICAL and value not in self.SPECIAL_COMPARISON and value not in self.COMPARISON:
             return False, f"Invalid Input - {value}"
@@ -127,93 +166,197 @@ class JsonSQL():
         elif value in self.LOGICAL and not isinstance(json_input[value], list):
             return False, f"Bad {value}, non list"
 
-        elif (value in self.ALLOWED_COLUMNS and not self.is_valid_comparison(value,json_input[value])):
-            if isinstance(json_input[value],dict):
-                value0 = list(json_input[value])[0]
-                if value0 not in self.COMPARISON and value0 not in self.SPECIAL_COMPARISON:
-                    return False, f"Non Valid comparitor - {value0}"
-            return False, f"Bad {value}, non {self.ALLOWED_COLUMNS[value]}"
+        elif value in self.ALLOWED_COLUMNS:
+            comparison = json_input[value]
+            if not self.is_valid_comparison(value, comparison):
+                if isinstance(comparison, dict) and len(comparison) > 0:
+                    value0 = next(iter(comparison))
+                    if value0 not in self.COMPARISON and value0 not in self.SPECIAL_COMPARISON:
+                        return False, f"Non Valid comparitor - {value0}"
+                return False, f"Bad {value}, non {self.ALLOWED_COLUMNS[value]}"
 
-        if self.is_valid_comparison(value, json_input[value]):
-            comparator = list(json_input[value])[0]
-            if comparator in self.COMPARISON and not self.is_another_column(json_input[value][comparator]) and not isinstance(json_input[value][comparator],dict):
-                return True, f"{value} {comparator if comparator != '!=' else '<>'} ?", json_input[value][comparator] if isinstance(json_input[value][comparator], tuple) else (json_input[value][comparator],)
-
-            elif comparator in self.COMPARISON and self.is_another_column(json_input[value][comparator]):
-                return True, f"{value} {comparator if comparator != '!=' else '<>'} {json_input[value][comparator]}", ()
+            comparator = next(iter(comparison))
+            operand = comparison[comparator]
+            if comparator in self.COMPARISON and not isinstance(operand, dict):
+                if not self.is_another_column(operand):
+                    return True, self._leaf_tmpl.get((value, comparator)) or self._leaf_template(value, comparator), (operand,)
+                return True, f"{value} {_SQL_COMPARATORS.get(comparator, comparator)} {operand}", ()
             
-            elif list(json_input[value][comparator])[0] in self.AGGREGATES:
-                return True, f"{value} {comparator if comparator != '!=' else '<>'} {list(json_input[value][comparator])[0]}({json_input[value][comparator][list(json_input[value][comparator])[0]]})", ()
+            elif isinstance(operand, dict) and next(iter(operand), None) in self.AGGREGATES:
+                return True, f"{value} {_SQL_COMPARATORS.get(comparator, comparator)} {self.make_aggregate(operand)[0]}", ()
 
-            elif comparator in self.SPECIAL_COMPARISON:
-                if comparator == "BETWEEN":
-                    return True, f"{value} BETWEEN ? AND ?", tuple(json_input[value][comparator])
+            elif comparator in self.SPECIAL_COMPARISON and isinstance(operand, list):
+                if comparator == "BETWEEN" and len(operand) == 2:
+                    return True, self._leaf_tmpl.get((value, comparator)) or self._leaf_template(value, comparator), tuple(operand)
 
-                elif comparator == "IN":
-                    return True, f"{value} IN ({'?' if len(json_input[value][comparator]) == 1 else ('?,'*len(json_input[value][comparator]))[:-1]})", tuple(json_input[value][comparator])
+                elif comparator == "IN" and len(operand) > 0:
+                    placeholders = _IN_PLACEHOLDERS[len(operand) - 1] if len(operand) <= len(_IN_PLACEHOLDERS) else "?" + ",?" * (len(operand) - 1)
+                    return True, f"{value} IN ({placeholders})", tuple(operand)
 
             return False, f"Comparitor Error - {comparator}"
         
         elif value in self.LOGICAL and isinstance(json_input[value], list):
             if len(json_input[value]) < 2:
-                return False, "Invalid boolean length, must be >= 2"
+                return _ERR_BOOLEAN_LENGTH
             
-            data = []
-            safe = (True, "")
-            for case in json_input[value]:
-                evaluation = self.logic_parse(case)
-                if not evaluation[0]:
-                    safe = evaluation
-                    break
+            return None, value, json_input[value]
 
-                data.append(evaluation[1:])
+        return False, f"Invalid Input - {value}"
+
+    def _canonicalize(self, json_input: dict) -> tuple[tuple, tuple] | None:
+        """Reduces a logic tree to its structure and its parameter values.
+
+        The structure holds the operators, columns, column types, comparators 
+        and operand types in depth first order, which is everything the parse result 
+        depends on apart from the parameter values themselves.
+
+        Returns:
+            tuple: (structure, params), or None if the tree contains column 
+            references, aggregates, unknown comparators, long value lists or 
+            anything malformed and so is not cached.
+        """
+        structure = []
+        params = []
+        stack = [json_input]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, dict) or len(node) == 0:
+                return None
+
+            value = next(iter(node))
+            operand = node[value]
+            if value in self.ALLOWED_COLUMNS:
+                if not isinstance(operand, dict) or len(operand) == 0:
+                    return None
+
+                comparator = next(iter(operand))
+                argument = operand[comparator]
+                if type(comparator) is not str or (comparator not in self.COMPARISON and comparator not in self.SPECIAL_COMPARISON):
+                    return None
 
-            if not safe[0]:
-                return safe
+                if isinstance(argument, list):
+                    if comparator not in self.SPECIAL_COMPARISON or len(argument) > _LOGIC_CACHE_MAX_VALUES or any(isinstance(entry, (list, dict, tuple)) or self.is_another_column(entry) for entry in argument):
+                        return None
+                    structure.append((value, self.ALLOWED_COLUMNS[value], comparator, tuple(map(type, argument))))
+                    params.extend(argument)
+
+                elif isinstance(argument, dict) or self.is_another_column(argument) or comparator in self.SPECIAL_COMPARISON:
+                    return None
 
-            params = []
-            output = []
-            for entry in data:
-                if isinstance(entry[1],tuple):
-                    for sub in entry[1]:
-                        params.append(sub)
                 else:
-                    params.append(entry[1])
-                output.append(entry[0])
+                    structure.append((value, self.ALLOWED_COLUMNS[value], comparator, type(argument)))
+                    params.append(argument)
 
-            params = tuple(params)
+            elif value in self.LOGICAL and isinstance(operand, list):
+                structure.append((value, len(operand)))
+                stack.extend(reversed(operand))
 
-            data = f"({f' {value.upper()} '.join(output)})"
+            else:
+                return None
 
-            return True, data, params if isinstance(params,tuple) else (params,)
+        return tuple(structure), tuple(params)
+
+    def logic_parse(self, json_input: dict) -> tuple[Literal[False], str] | tuple[Literal[True], str, tuple]:
+        """Parses a logic tree into a parameterized SQL condition.
+
+        Successful AND/OR trees are kept in a least recently used cache keyed 
+        by their structure, so a condition that only differs from an earlier 
+        one in its parameter values reuses the earlier SQL string without 
+        being validated again. Single leaves are cheap to parse and skip the 
+        cache.
+
+        Args:
+            json_input (dict): The logic tree to parse.
+
+        Returns:
+            tuple: (True, sql, params) on success, (False, error) otherwise.
+        """
+        if not isinstance(json_input, dict) or next(iter(json_input), None) not in self.LOGICAL:
+            return self._logic_walk(json_input)
+
+        canonical = self._canonicalize(json_input)
+        if canonical is None:
+            return self._logic_walk(json_input)
+
+        structure, params = canonical
+        sql = self._logic_cache.pop(structure, None)
+        if sql is not None:
+            self._logic_cache[structure] = sql
+            return True, sql, params
+
+        evaluation = self._logic_walk(json_input)
+        if evaluation[0]:
+            if len(self._logic_cache) >= _LOGIC_CACHE_SIZE:
+                self._logic_cache.pop(next(iter(self._logic_cache)), None)
+            self._logic_cache[structure] = evaluation[1]
+        return evaluation
+
+    def _logic_walk(self, json_input: dict) -> tuple[Literal[False], str] | tuple[Literal[True], str, tuple]:
+        """Parses a logic tree depth first with an explicit stack, so deeply 
+        nested AND/OR conditions do not grow the Python call stack.
+        """
+        stack = []
+        node = json_input
+        while True:
+            evaluation = self._logic_node(node)
+            if evaluation[0] is None:
+                cases = evaluation[2]
+                stack.append((evaluation[1], iter(cases[1:]), []))
+                node = cases[0]
+                continue
+
+            if not evaluation[0]:
+                return evaluation
+
+            while stack:
+                value, cases, data = stack[-1]
+                data.append(evaluation[1:])
+                node = next(cases, _END)
+                if node is not _END:
+                    break
+
+                stack.pop()
+                output = [entry[0] for entry in data]
+                params = tuple(chain.from_iterable(entry[1] for entry in data))
+                evaluation = (True, f"({f' {value.upper()} '.join(output)})", params)
+            else:
+                return evaluation
 
-        
     def sql_parse(self, json_input: dict) -> tuple[Literal[False],str] | tuple[Literal[True], str, tuple]:
-        required_inputs: dict = {"query":str, "items":list, "table":str}
-        for item in required_inputs:
-            if item not in json_input and item != "connection":
-                return False, f"Missing argument {item}"
-            elif not isinstance(json_input[item],required_inputs[item]):
-                return False, f"{item} not right type, {required_inputs[item]}"
+        for item, itemtype in _REQUIRED_INPUTS.items():
+            if item not in json_input:
+                return _ERR_MISSING[item]
+            elif not isinstance(json_input[item], itemtype):
+                return _ERR_TYPE[item]
             
         if json_input["query"] not in self.ALLOWED_QUERIES:
             return False, f"Query not allowed - {json_input['query']}"
 
-        for item in range(len(json_input["items"])):
-            if json_input["items"][item] not in self.ALLOWED_ITEMS and not (isinstance(json_input["items"][item], dict) and list(json_input["items"][item])[0] in self.AGGREGATES):
-                return False, f"Item not allowed - {json_input['items'][item]}"
-            elif isinstance(json_input["items"][item], dict) and list(json_input["items"][item])[0] in self.AGGREGATES:
-                if json_input["items"][item][list(json_input["items"][item])[0]] in self.ALLOWED_ITEMS:
-                    json_input["items"][item] = f"{list(json_input['items'][item])[0]}({json_input['items'][item][list(json_input['items'][item])[0]]})"
-                else:
-                    return False, f"Item not allowed - {json_input['items'][item][list(json_input['items'][item])[0]]}"
+        items = json_input["items"]
+        if all(map(isinstance, items, repeat(str))):
+            if set(items).difference(self.ALLOWED_ITEMS):
+                return False, f"Item not allowed - {next(item for item in items if item not in self.ALLOWED_ITEMS)}"
+        else:
+            for item in range(len(items)):
+                if isinstance(items[item], dict):
+                    if next(iter(items[item]), None) not in self.AGGREGATES:
+                        return False, f"Item not allowed - {items[item]}"
+
+                    aggregate_sql, aggregate_argument = self.make_aggregate(items[item])
+                    if isinstance(aggregate_argument, str) and aggregate_argument in self.ALLOWED_ITEMS:
+                        items[item] = aggregate_sql
+                    else:
+                        return False, f"Item not allowed - {aggregate_argument}"
+
+                elif not (isinstance(items[item], str) and items[item] in self.ALLOWED_ITEMS):
+                    return False, f"Item not allowed - {items[item]}"
 
                
         if json_input["table"] not in self.ALLOWED_TABLES:
             return False, f"Table not allowed - {json_input['table']}"        
 
         
-        if "connection" in json_input and json_input["connection"] not in self.ALLOWED_CONNECTIONS:
+        if "connection" in json_input and not (isinstance(json_input["connection"], str) and json_input["connection"] in self.ALLOWED_CONNECTIONS):
             return False, f"Connection not allowed - {json_input['connection']}"
         
         sql_string = f"{json_input['query']} {','.join(json_input['items'])} FROM {json_input['table']}"
@@ -221,8 +364,8 @@ class JsonSQL():
         if "logic" in json_input:
             logic_string = self.logic_parse(json_input["logic"])
             if not logic_string[0]:
-                return False, f"Logic Fail - {logic_string[1]}"
+                return False, "Logic Fail - " + logic_string[1]
             
-            return True, f"{sql_string} {json_input['connection']} {logic_string[1]}", logic_string[2] if isinstance(logic_string[2], tuple) else (logic_string[2],)
+            return True, f"{sql_string} {json_input['connection']} {logic_string[1]}", logic_string[2]
         
-        return True, sql_string, ()
\ No newline at end of file
+        return True, sql_string, ()
@@ -104,3 +104,13 @@ def test_valid_sql_without_logic_with_aggregate_table(jsonsql: JsonSQL):
     assert result is True
     assert sql == "SELECT MIN(column) FROM table1"
     assert params == ()
+
+
+def test_empty_aggregate_item(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_QUERIES = ["SELECT"]
+    jsonsql.ALLOWED_ITEMS = ["column"]
+    jsonsql.ALLOWED_TABLES = ["table1"]
+    input = {"query": "SELECT", "items": [{}], "table": "table1"}
+    result, msg = jsonsql.sql_parse(input)
+    assert result is False
+    assert msg == "Item not allowed - {}"
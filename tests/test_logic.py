@@ -1,4 +1,6 @@
+import pickle
 import pytest
+import src.jsonsql.jsonsql
 from src.jsonsql import JsonSQL
 
 
@@ -128,6 +130,15 @@ def test_valid_in_condition(jsonsql: JsonSQL):
     assert params == (5, 10, 15)
 
 
+def test_valid_in_condition_mixed_values(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": int, "col2": int}
+    input = {"col1": {"IN": [5, "col2"]}}
+    result, sql, params = jsonsql.logic_parse(input)
+    assert result is True
+    assert sql == "col1 IN (?,?)"
+    assert params == (5, "col2")
+
+
 def test_valid_eq_condition_column(jsonsql: JsonSQL):
     jsonsql.ALLOWED_COLUMNS = {"col1": int, "col2": int}
     input = {"col1": {"=": "col2"}}
@@ -188,4 +199,117 @@ def test_valid_aggregate_condition_column(jsonsql: JsonSQL):
     result, sql, params = jsonsql.logic_parse(input)
     assert result is True
     assert sql == "col1 = MIN(col2)"
-    assert params == ()
\ No newline at end of file
+    assert params == ()
+
+
+def test_valid_deeply_nested_condition(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": int}
+    input = {"col1": {"=": 0}}
+    for depth in range(1, 5000):
+        input = {"AND": [input, {"col1": {"=": depth}}]}
+    result, sql, params = jsonsql.logic_parse(input)
+    assert result is True
+    assert sql.startswith("((((")
+    assert params == tuple(range(5000))
+
+
+def test_invalid_operator_as_key(jsonsql: JsonSQL):
+    input = {"IN": [1, 2]}
+    result, msg = jsonsql.logic_parse(input)
+    assert result is False
+    assert msg == "Invalid Input - IN"
+
+
+def test_cached_structure_new_params(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": int, "col2": str}
+    first = jsonsql.logic_parse({"AND": [{"col1": {"IN": [1, 2]}}, {"col2": {"=": "a"}}]})
+    second = jsonsql.logic_parse({"AND": [{"col1": {"IN": [3, 4]}}, {"col2": {"=": "b"}}]})
+    assert first == (True, "(col1 IN (?,?) AND col2 = ?)", (1, 2, "a"))
+    assert second == (True, "(col1 IN (?,?) AND col2 = ?)", (3, 4, "b"))
+
+
+def test_cache_cleared_on_new_columns(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": int}
+    assert jsonsql.logic_parse({"col1": {"=": 1}})[0] is True
+    jsonsql.ALLOWED_COLUMNS = {"col1": str}
+    result, msg = jsonsql.logic_parse({"col1": {"=": 1}})
+    assert result is False
+    assert msg == "Bad col1, non <class 'str'>"
+
+
+@pytest.mark.parametrize("comparator", ["BETWEEN", "IN"])
+@pytest.mark.parametrize("operand", ["", "value"])
+def test_special_comparison_string_operand(jsonsql: JsonSQL, comparator, operand):
+    jsonsql.ALLOWED_COLUMNS = {"col1": str}
+    input = {"col1": {comparator: operand}}
+    result, msg = jsonsql.logic_parse(input)
+    assert result is False
+    assert msg == f"Comparitor Error - {comparator}"
+
+
+def test_allowed_columns_changed_in_place(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": int, "col2": int}
+    input = {"AND": [{"col1": {"=": 1}}, {"col2": {"=": 2}}]}
+    assert jsonsql.logic_parse(input)[0] is True
+    jsonsql.ALLOWED_COLUMNS["col1"] = str
+    result, msg = jsonsql.logic_parse(input)
+    assert result is False
+    assert msg == "Bad col1, non <class 'str'>"
+    jsonsql.ALLOWED_COLUMNS["col3"] = int
+    result, sql, params = jsonsql.logic_parse({"col3": {"=": 3}})
+    assert result is True
+    assert sql == "col3 = ?"
+    assert params == (3,)
+
+
+def test_pickle_round_trip():
+    jsonsql = JsonSQL(["SELECT"], ["*"], ["table1"], ["WHERE"], {"col1": int})
+    jsonsql.logic_parse({"AND": [{"col1": {"=": 1}}, {"col1": {"=": 2}}]})
+    restored = pickle.loads(pickle.dumps(jsonsql))
+    assert restored.logic_parse({"col1": {"IN": [1, 2]}}) == (True, "col1 IN (?,?)", (1, 2))
+
+
+def test_empty_in_list_column_type(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": list}
+    input = {"col1": {"IN": []}}
+    result, msg = jsonsql.logic_parse(input)
+    assert result is False
+    assert msg == "Comparitor Error - IN"
+
+
+def test_cache_skips_failures_and_long_lists(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": int}
+    jsonsql.logic_parse({"AND": [{"col1": {"bogus": 1}}, {"col1": {"=": 1}}]})
+    jsonsql.logic_parse({"AND": [{"col1": {"=": "value"}}, {"col1": {"=": 1}}]})
+    jsonsql.logic_parse({"AND": [{"col1": {"IN": list(range(100))}}, {"col1": {"=": 1}}]})
+    assert jsonsql._logic_cache == {}
+
+
+def test_cached_list_operand_plain_comparison(jsonsql: JsonSQL):
+    jsonsql.ALLOWED_COLUMNS = {"col1": object, "col2": int}
+    input = {"AND": [{"col1": {"=": [1, 2]}}, {"col2": {"=": 3}}]}
+    first = jsonsql.logic_parse(input)
+    second = jsonsql.logic_parse(input)
+    assert first == (True, "(col1 = ? AND col2 = ?)", ([1, 2], 3))
+    assert second == first
+
+
+def test_cache_evicts_least_recently_used(jsonsql: JsonSQL, monkeypatch):
+    monkeypatch.setattr(src.jsonsql.jsonsql, "_LOGIC_CACHE_SIZE", 2)
+    jsonsql.ALLOWED_COLUMNS = {"col1": int}
+    hot = {"AND": [{"col1": {"=": 1}}, {"col1": {"=": 2}}]}
+    cold = {"OR": [{"col1": {"=": 1}}, {"col1": {"=": 2}}]}
+    jsonsql.logic_parse(hot)
+    jsonsql.logic_parse(cold)
+    jsonsql.logic_parse(hot)
+    jsonsql.logic_parse({"AND": [{"col1": {">": 1}}, {"col1": {"=": 2}}]})
+    assert jsonsql._canonicalize(hot)[0] in jsonsql._logic_cache
+    assert jsonsql._canonicalize(cold)[0] not in jsonsql._logic_cache
+
+
+@pytest.mark.parametrize("comparison", [{}, {"=": {}}, {"IN": [{}]}])
+def test_empty_dicts(jsonsql: JsonSQL, comparison):
+    jsonsql.ALLOWED_COLUMNS = {"col1": int}
+    result, msg = jsonsql.logic_parse({"col1": comparison})
+    assert result is False
+    assert msg == "Bad col1, non <class 'int'>"